@@ -71,9 +71,9 @@
 # The original enum4linux.pl was released under GPL version 2 or later.
 # The original polenum.py was released under GPL version 3.
 
-from argparse import ArgumentParser
-from collections import OrderedDict
-from datetime import datetime
+from argparse import ArgumentParser, ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import json
 import os
 import random
@@ -81,9 +81,11 @@ import re
 import shutil
 import shlex
 import socket
-from subprocess import check_output, STDOUT, TimeoutExpired
+import string
+from subprocess import check_output, CalledProcessError, STDOUT, TimeoutExpired
 import sys
 import tempfile
+from time import perf_counter
 from impacket import nmb, smb, smbconnection, smb3, nt_errors
 from impacket.smbconnection import SMB_DIALECT
 from impacket.dcerpc.v5.rpcrt import DCERPC_v5
@@ -91,9 +93,9 @@ from impacket.dcerpc.v5 import transport, samr
 from ldap3 import Server, Connection, DSA
 import yaml
 try:
-    from yaml import CDumper as Dumper
+    from yaml import CSafeDumper as Dumper
 except ImportError:
-    from yaml import Dumper
+    from yaml import SafeDumper as Dumper
 
 ###############################################################################
 # The following  mappings for nmblookup (nbtstat) status codes to human readable
@@ -156,6 +158,26 @@ NBT_INFO = [
     ['Forte_$ND800ZA', "20", True, "DCA IrmaLan Gateway Server Service"]
 ]
 
+def index_nbt_info(nbt_info):
+    '''
+    Indexes NBT_INFO by (code, group), which allows nmblookup_to_human() to do a dictionary lookup instead of
+    scanning the whole table for every line. NBT_INFO is matched top-down and the first match wins, therefore
+    pattern entries are only kept if they are listed before the catch-all entry (empty pattern) of their key.
+    Returns a dict with the catch-all descriptions and a dict with the lists of (pattern, description).
+    '''
+    defaults = {}
+    patterns = {}
+    for pattern, code, group, desc in nbt_info:
+        if (code, group) in defaults:
+            continue
+        if pattern:
+            patterns.setdefault((code, group), []).append((pattern, desc))
+        else:
+            defaults[(code, group)] = desc
+    return defaults, patterns
+
+NBT_INFO_DEFAULTS, NBT_INFO_PATTERNS = index_nbt_info(NBT_INFO)
+
 # ACB (Account Control Block) contains flags an SAM account
 ACB_DICT = {
         0x00000001: "Account Disabled",
@@ -190,6 +212,13 @@ OS_VERSIONS = {
         "5.0": "Windows 2000",
         }
 
+# Mapping from group type to the rpcclient command which enumerates the groups of this type
+GROUP_TYPES = {
+        "builtin": "enumalsgroups builtin",
+        "local": "enumalsgroups domain",
+        "domain": "enumdomgroups"
+        }
+
 # Filter for various samba client setup related error messages including bug
 # https://bugzilla.samba.org/show_bug.cgi?id=13925
 SAMBA_CLIENT_ERRORS = [
@@ -259,6 +288,52 @@ DEPS = ["nmblookup", "net", "rpcclient", "smbclient"]
 RID_RANGES = "500-550,1000-1050"
 KNOWN_USERNAMES = "administrator,guest,krbtgt,domain admins,root,bin,none"
 TIMEOUT = 5
+THREADS = 10
+RID_BATCH_SIZE = 50
+
+# Pre-compiled regular expressions used for parsing the output of the various enumeration modules
+NT_STATUS_COMMON_ERRORS_RE = re.compile('|'.join(re.escape(error) for error in NT_STATUS_COMMON_ERRORS))
+# Matches every complete line (including its line break) which contains one of the SAMBA_CLIENT_ERRORS
+SAMBA_CLIENT_ERRORS_RE = re.compile(r"^[^\n]*(?:" + '|'.join(re.escape(error) for error in SAMBA_CLIENT_ERRORS) + r")[^\n]*\n?", re.MULTILINE)
+NMBLOOKUP_WORKGROUP_RE = re.compile(r"^\s+(\S+)\s+<00>\s+-\s+<GROUP>\s+", re.MULTILINE)
+NMBLOOKUP_LINE_RE = re.compile(r"^(\S+)\s+<(..)>\s+-\s+?(<GROUP>)?\s+?[A-Z]")
+LDAP_LONG_DOMAIN_RE = re.compile(r"(DC=[^,]+,DC=[^,]+)$")
+LSAQUERY_DOMAIN_NAME_RE = re.compile(r"Domain Name: (.*)")
+LSAQUERY_DOMAIN_SID_RE = re.compile(r"Domain Sid: (S-\d+-\d+-\d+-\d+-\d+-\d+)")
+SRVINFO_SERVER_TYPE_STRING_RE = re.compile(r"\s+[^\s]+\s+(.*)")
+SRVINFO_OS_INFO_RE = re.compile(r"[ \t]+(platform_id|os version|server type)[ \t]+:[ \t]+(.*)")
+SRVINFO_SAMBA_VERSION_RE = re.compile(r".*(Samba\s.*[^)])")
+QUERYDISPINFO_RE = re.compile(r"index:[ \t]+.*[ \t]+RID:[ \t]+(0x[A-F-a-f0-9]+)[ \t]+acb:[ \t]+(.*)[ \t]+Account:[ \t]+(.*)[ \t]+Name:[ \t]+(.*)[ \t]+Desc:[ \t]+(.*)")
+ENUMDOMUSERS_RE = re.compile(r"user:\[(.*)\][ \t]rid:\[(0x[A-F-a-f0-9]+)\]")
+ENUMGROUPS_RE = re.compile(r"group:\[(.*)\][ \t]rid:\[(0x[A-F-a-f0-9]+)\]")
+# Matches the "key : value" lines (and the lines without a value) of rpcclient's queryuser and querygroup
+DETAILS_RE = re.compile(r"^\t*(?=[^\t\n])([^:\n]*?)[ \t]*(?::\t*(.*))?$", re.MULTILINE)
+SID_RES = (
+    re.compile(r"(S-1-5-21-[\d-]+)-\d+"),
+    re.compile(r"(S-1-5-[\d-]+)-\d+"),
+    re.compile(r"(S-1-22-[\d-]+)-\d+")
+)
+SID_ANY_RE = re.compile(r"(S-1-(?:5-21|5|22)-[\d-]+)-\d+")
+LOOKUPSIDS_RE = re.compile(r"(S-\d+-\d+-\d+-(?:[\d-]*-)?(\d+)[ \t]+(.*)[ \t]+\((\d+)\))")
+LOOKUPSIDS_SAMBA_UID_RE = re.compile(r"-(\d+) .*\\\1 \(")
+# All status messages check_access() reacts to, the lookahead also finds overlapping occurrences
+SHARE_ACCESS_STATUS_RE = re.compile(r"(?=(NT_STATUS_BAD_NETWORK_NAME|NT_STATUS_ACCESS_DENIED listing|NT_STATUS_WRONG_PASSWORD|"
+                                    r"tree connect failed: NT_STATUS_ACCESS_DENIED|NT_STATUS_INVALID_INFO_CLASS|"
+                                    r"NT_STATUS_NETWORK_ACCESS_DENIED|NT_STATUS_OBJECT_NAME_NOT_FOUND|NT_STATUS_INVALID_PARAMETER))")
+SHARES_RE = re.compile(r"^\s*([\S]+)\s+(Device|Disk|IPC|Printer)[ \t]*([^\n]*)$", re.MULTILINE|re.IGNORECASE)
+# Either the ".." directory entry or the "blocks of size ... blocks available" summary line of a share listing
+SHARE_LISTING_RE = re.compile(r"\n\s+\.\.\s+D.*\d{4}\n|blocks\sof\ssize.*blocks\savailable")
+PRINTERS_RE = re.compile(r"\s*flags:\[([^\n]*)\]\n\s*name:\[([^\n]*)\]\n\s*description:\[([^\n]*)\]\n\s*comment:\[([^\n]*)\]", re.MULTILINE)
+SERVICES_RE = re.compile(r"([^\s]*)\s*\"(.*)\"", re.MULTILINE)
+
+# Pre-compiled regular expressions used for validating user input
+# A single RID range like "500-550" or just a single RID like "1199", used with fullmatch()
+RID_RANGE_RE = re.compile(r"(\d+)(?:-(\d+))?")
+SHARE_NAME_RE = re.compile(r"^[a-zA-Z0-9\._\$-]+$")
+# All bytes which may appear in a shares file which consists of valid share names only
+SHARES_FILE_BYTES = (string.ascii_letters + string.digits + "._$-\n").encode()
+HEX_RE = re.compile("^0x[0-9a-f]+$", re.IGNORECASE)
+WORKGROUP_RE = re.compile(r"^[A-Za-z0-9_\.-]+$")
 
 # global_verbose and global_colors should be the only variables which should be written to
 global_verbose = False
@@ -312,11 +387,12 @@ class Target:
     passed during the enumeration to the various modules. This allows to modify/update target information
     during enumeration.
     '''
-    def __init__(self, host, workgroup, port=None, timeout=None, tls=None, samba_config=None, sessions=False):
+    def __init__(self, host, workgroup, port=None, timeout=None, threads=THREADS, tls=None, samba_config=None, sessions=False):
         self.host = host
         self.port = port
         self.workgroup = workgroup
         self.timeout = timeout
+        self.threads = threads
         self.tls = tls
         self.samba_config = samba_config
         self.sessions = sessions
@@ -352,7 +428,7 @@ class Target:
             if result[0][0] == socket.AF_INET:
                 self.ip_version = 4
                 return True
-        except:
+        except (OSError, UnicodeError):
             pass
         return False
 
@@ -365,12 +441,12 @@ class Credentials:
     '''
     def __init__(self, user, pw):
         # Create an alternative user with pseudo-random username
-        self.random_user = ''.join(random.choice("abcdefghijklmnopqrstuvwxyz") for i in range(8))
+        self.random_user = ''.join(random.choices(string.ascii_lowercase, k=8))
         self.user = user
         self.pw = pw
 
     def as_dict(self):
-        return {'credentials':OrderedDict({'user':self.user, 'password':self.pw, 'random_user':self.random_user})}
+        return {'credentials':{'user':self.user, 'password':self.pw, 'random_user':self.random_user}}
 
 class SambaConfig:
     '''
@@ -380,10 +456,11 @@ class SambaConfig:
     '''
     def __init__(self, entries):
         config = '\n'.join(['[global]']+entries) + '\n'
-        config_file = tempfile.NamedTemporaryFile(delete=False)
-        config_file.write(config.encode())
-        self.config_filename = config_file.name
-        config_file.close()
+        config_fd, self.config_filename = tempfile.mkstemp()
+        try:
+            os.write(config_fd, config.encode())
+        finally:
+            os.close(config_fd)
 
     def get_path(self):
         return self.config_filename
@@ -395,7 +472,7 @@ class SambaConfig:
             config_file.write(config)
             config_file.close()
             return True
-        except:
+        except OSError:
             return False
 
     def delete(self):
@@ -409,13 +486,13 @@ class Output:
     '''
     Output stores the output dictionary which will be filled out during the run of
     the tool. The update() function takes a dictionary, which will then be merged
-    into the output dictionary (out_dict). In addition, the update() function is
-    responsible for writing the JSON/YAML output.
+    into the output dictionary (out_dict). The JSON/YAML output is written only once
+    by the flush() function at the end of the tool run (also on CTRL+C).
     '''
     def __init__(self, out_file=None, out_file_type=None):
         self.out_file = out_file
         self.out_file_type = out_file_type
-        self.out_dict = OrderedDict({"errors":{}})
+        self.out_dict = {"errors":{}}
 
     def update(self, content):
         # The following is needed, since python3 does not support nested merge of
@@ -441,8 +518,8 @@ class Output:
                     self.out_dict["errors"][key] = value
 
     def flush(self):
-        # Only for nice JSON/YAML output (errors at the end)
-        self.out_dict.move_to_end("errors")
+        # Only for nice JSON/YAML output (errors at the end), dicts keep insertion order
+        self.out_dict["errors"] = self.out_dict.pop("errors")
 
         # Write JSON/YAML
         if self.out_file is not None:
@@ -453,20 +530,24 @@ class Output:
         return Result(True, "")
 
     def _write_json(self):
-        try:
-            f = open(f"{self.out_file}.json", 'w')
-            f.write(json.dumps(self.out_dict, indent=4))
-            f.close()
-        except OSError:
-            return False
-        return True
+        return self._write_file(f"{self.out_file}.json", json.dumps(self.out_dict, indent=4))
 
     def _write_yaml(self):
+        return self._write_file(f"{self.out_file}.yaml", yamlize(self.out_dict, rstrip=False))
+
+    def _write_file(self, filename, content):
+        # Write to a temporary file first and rename it afterwards. This way an existing output
+        # file is never left truncated if writing fails or the tool gets interrupted.
+        tmp_filename = f"{filename}.tmp"
         try:
-            f = open(f"{self.out_file}.yaml", 'w')
-            f.write(yamlize(self.out_dict, rstrip=False))
-            f.close()
+            with open(tmp_filename, 'w') as f:
+                f.write(content)
+            os.replace(tmp_filename, filename)
         except OSError:
+            try:
+                os.remove(tmp_filename)
+            except OSError:
+                pass
             return False
         return True
 
@@ -479,7 +560,7 @@ class ServiceScan():
     def __init__(self, target, scan_list):
         self.target = target
         self.scan_list = scan_list
-        self.services = OrderedDict({})
+        self.services = {}
 
     def run(self):
         module_name = ENUM_SERVICES
@@ -583,12 +664,12 @@ class EnumNetbios():
         '''
         Extract workgroup from given nmblookoup result.
         '''
-        match = re.search(r"^\s+(\S+)\s+<00>\s+-\s+<GROUP>\s+", nmblookup_result, re.MULTILINE)
+        match = NMBLOOKUP_WORKGROUP_RE.search(nmblookup_result)
         if match:
             if valid_workgroup(match.group(1)):
                 workgroup = match.group(1)
             else:
-                return Result(None, f"Workgroup {workgroup} contains some illegal characters")
+                return Result(None, f"Workgroup {match.group(1)} contains some illegal characters")
         else:
             return Result(None, "Could not find workgroup/domain")
         return Result(workgroup, f"Got domain/workgroup name: {workgroup}")
@@ -598,30 +679,30 @@ class EnumNetbios():
         Map nmblookup output to human readable strings.
         '''
         output = []
-        nmblookup_result = nmblookup_result.splitlines()
-        for line in nmblookup_result:
-            if "Looking up status of" in line or line == "":
+        # Remove all tabs at once instead of line by line
+        nmblookup_result = nmblookup_result.translate({ord("\t"): None})
+        for line in nmblookup_result.splitlines():
+            if not line or "Looking up status of" in line:
                 continue
 
-            line = line.replace("\t", "")
-            match = re.match(r"^(\S+)\s+<(..)>\s+-\s+?(<GROUP>)?\s+?[A-Z]", line)
+            match = NMBLOOKUP_LINE_RE.match(line)
             if match:
                 line_val = match.group(1)
                 line_code = match.group(2).upper()
                 line_group = not match.group(3)
-                for entry in NBT_INFO:
-                    pattern, code, group, desc = entry
-                    if pattern:
-                        if pattern in line_val and line_code == code and line_group == group:
-                            output.append(line + " " + desc)
-                            break
-                    else:
-                        if line_code == code and line_group == group:
-                            output.append(line + " " + desc)
-                            break
+                key = (line_code, line_group)
+                for pattern, desc in NBT_INFO_PATTERNS.get(key, []):
+                    if pattern in line_val:
+                        break
+                else:
+                    desc = NBT_INFO_DEFAULTS.get(key)
+                if desc:
+                    output.append(line + " " + desc)
             else:
                 output.append(line)
-        return Result(output, f"Full NetBIOS names information:\n{yamlize(output)}")
+        # This is a flat list of strings, no need to run it through the YAML dumper for printing
+        nmblookup_human = '\n'.join(output)
+        return Result(output, f"Full NetBIOS names information:\n{nmblookup_human}")
 
 ### SMB checks
 
@@ -638,10 +719,10 @@ class EnumSmb():
         print_heading(f"SMB Dialect Check on {self.target.host}")
         output = {}
 
-        for port in self.target.smb_ports:
+        results = parallel_map(self.check_smb1, self.target.smb_ports, max_workers=len(self.target.smb_ports))
+        for port, result in zip(self.target.smb_ports, results):
             print_info(f"Check for legacy SMBv1 on {port}/tcp")
             self.target.port = port
-            result = self.check_smb1()
             if result.retval is None:
                 output = process_error(result.retmsg, ["smb1_only"], module_name, output)
             else:
@@ -663,11 +744,11 @@ class EnumSmb():
         try:
             if self.target.samba_config.add(['client min protocol = NT1']):
                 return Result(True, "")
-        except:
+        except Exception:
             pass
         return Result(False, "Could not enforce SMBv1")
 
-    def check_smb1(self):
+    def check_smb1(self, port):
         '''
         Current implementations of the samba client tools will enforce at least SMBv2 by default. This will give false
         negatives during session checks, if the target only supports SMBv1. Therefore, we try to find out here whether
@@ -675,7 +756,7 @@ class EnumSmb():
         '''
 
         try:
-            smb_conn = smbconnection.SMBConnection(self.target.host, self.target.host, sess_port=self.target.port, timeout=self.target.timeout)
+            smb_conn = smbconnection.SMBConnection(self.target.host, self.target.host, sess_port=port, timeout=self.target.timeout)
             dialect = smb_conn.getDialect()
             smb_conn.close()
             if dialect == SMB_DIALECT:
@@ -684,16 +765,16 @@ class EnumSmb():
         except Exception as e:
             if len(e.args) == 2:
                 if isinstance(e.args[1], ConnectionRefusedError):
-                    return Result(None, f"SMB connection error on port {self.target.port}/tcp: Connection refused")
+                    return Result(None, f"SMB connection error on port {port}/tcp: Connection refused")
                 if isinstance(e.args[1], socket.timeout):
-                    return Result(None, f"SMB connection error on port {self.target.port}/tcp: timed out")
+                    return Result(None, f"SMB connection error on port {port}/tcp: timed out")
             if isinstance(e, nmb.NetBIOSError):
-                return Result(None, f"SMB connection error on port {self.target.port}/tcp: session failed")
+                return Result(None, f"SMB connection error on port {port}/tcp: session failed")
             if isinstance(e, (smb.SessionError, smb3.SessionError)):
                 if e.get_error_code() == nt_errors.STATUS_NOT_SUPPORTED:
                     return Result(False, "Server supports dialects higher SMBv1")
                 return Result(None, "SMB connection error: session failed")
-            return Result(None, f"SMB connection error on port {self.target.port}/tcp")
+            return Result(None, f"SMB connection error on port {port}/tcp")
 
 ### Session Checks
 
@@ -713,9 +794,17 @@ class EnumSessions():
                   "user_session_possible":False,
                   "random_user_session_possible":False}
 
+        # Null session, user session (only if a user was given) and random user session checks,
+        # each as (creds, random_user_session)
+        session_checks = [(Credentials('', ''), False)]
+        if self.creds.user:
+            session_checks.append((self.creds, False))
+        session_checks.append((self.creds, True))
+        results = parallel_map(self.check_user_session, *zip(*session_checks), max_workers=len(session_checks))
+
         # Check null session
         print_info("Check for null session")
-        null_session = self.check_user_session(Credentials('', ''))
+        null_session = next(results)
         if null_session.retval:
             output["null_session_possible"] = True
             print_success(null_session.retmsg)
@@ -725,7 +814,7 @@ class EnumSessions():
         # Check user session
         if self.creds.user:
             print_info("Check for user session")
-            user_session = self.check_user_session(self.creds)
+            user_session = next(results)
             if user_session.retval:
                 output["user_session_possible"] = True
                 print_success(user_session.retmsg)
@@ -734,7 +823,7 @@ class EnumSessions():
 
         # Check random user session
         print_info("Check for random user session")
-        user_session = self.check_user_session(self.creds, random_user_session=True)
+        user_session = next(results)
         if user_session.retval:
             output["random_user_session_possible"] = True
             print_success(user_session.retmsg)
@@ -828,12 +917,8 @@ class EnumLdapDomainInfo():
         if namingcontexts.retval:
             # Parent/root or child DC?
             result = self.check_parent_dc(namingcontexts.retval)
-            if result.retval:
-                output["is_parent_dc"] = True
-                output["is_child_dc"] = False
-            else:
-                output["is_parent_dc"] = True
-                output["is_child_dc"] = False
+            output["is_parent_dc"] = result.retval
+            output["is_child_dc"] = not result.retval
             print_success(result.retmsg)
 
             # Try to get long domain from ldapsearch result
@@ -869,10 +954,8 @@ class EnumLdapDomainInfo():
                 return Result(None, f"LDAPS connect error: {error}")
             return Result(None, f"LDAP connect error: {error}")
 
-        try:
-            if not server.info.naming_contexts:
-                return Result([], "NamingContexts are not readable")
-        except Exception as e:
+        # server.info stays None if the RootDSE could not be read
+        if server.info is None or not server.info.naming_contexts:
             return Result([], "NamingContexts are not readable")
 
         return Result(server.info.naming_contexts, "")
@@ -884,7 +967,7 @@ class EnumLdapDomainInfo():
         long_domain = ""
 
         for entry in namingcontexts_result:
-            match = re.search("(DC=[^,]+,DC=[^,]+)$", entry)
+            match = LDAP_LONG_DOMAIN_RE.search(entry)
             if match:
                 long_domain = match.group(1)
                 long_domain = long_domain.replace("DC=", "")
@@ -899,11 +982,7 @@ class EnumLdapDomainInfo():
         Checks whether the target is a parent or child domain controller.
         This is done by searching for specific naming contexts.
         '''
-        parent = False
-        namingcontexts_result = '\n'.join(namingcontexts_result)
-        if "DC=DomainDnsZones" in namingcontexts_result or "ForestDnsZones" in namingcontexts_result:
-            parent = True
-        if parent:
+        if any("DC=DomainDnsZones" in entry or "ForestDnsZones" in entry for entry in namingcontexts_result):
             return Result(True, "Appears to be root/parent DC")
         return Result(False, "Appears to be child DC")
 
@@ -978,7 +1057,7 @@ class EnumLsaqueryDomainInfo():
         '''
         workgroup = ""
         if "Domain Name" in lsaquery_result:
-            match = re.search("Domain Name: (.*)", lsaquery_result)
+            match = LSAQUERY_DOMAIN_NAME_RE.search(lsaquery_result)
             if match:
                 #FIXME: Validate domain? --> See valid_workgroup()
                 workgroup = match.group(1)
@@ -995,7 +1074,7 @@ class EnumLsaqueryDomainInfo():
         if "Domain Sid: (NULL SID)" in lsaquery_result:
             domain_sid = "NULL SID"
         else:
-            match = re.search(r"Domain Sid: (S-\d+-\d+-\d+-\d+-\d+-\d+)", lsaquery_result)
+            match = LSAQUERY_DOMAIN_SID_RE.search(lsaquery_result)
             if match:
                 domain_sid = match.group(1)
         if domain_sid:
@@ -1009,7 +1088,7 @@ class EnumLsaqueryDomainInfo():
         '''
         if "Domain Sid: S-0-0" in lsaquery_result or "Domain Sid: (NULL SID)" in lsaquery_result:
             return Result("workgroup", "Host is part of a workgroup (not a domain)")
-        if re.search(r"Domain Sid: S-\d+-\d+-\d+-\d+-\d+-\d+", lsaquery_result):
+        if LSAQUERY_DOMAIN_SID_RE.search(lsaquery_result):
             return Result("domain", "Host is part of a domain (not a workgroup)")
         return Result(False, "Could not determine if host is part of domain or part of a workgroup")
 
@@ -1062,22 +1141,17 @@ class EnumOsInfo():
         Takes the result of rpcclient's srvinfo command and tries to extract information like
         platform_id, os version and server type.
         '''
-        search_pattern_list = ["platform_id", "os version", "server type"]
-
         os_info = {}
-        first = True
-        for line in srvinfo_result.splitlines():
-            if first:
-                match = re.search(r"\s+[^\s]+\s+(.*)", line)
-                if match:
-                    os_info['server_type_string'] = match.group(1)
-                first = False
-            for search_pattern in search_pattern_list:
-                match = re.search(fr"\s+{search_pattern}\s+:\s+(.*)", line)
-                if match:
-                    # os version => os_version, server type => server_type
-                    search_pattern = search_pattern.replace(" ", "_")
-                    os_info[search_pattern] = match.group(1)
+
+        # The server type string is found in the first line of the output
+        match = SRVINFO_SERVER_TYPE_STRING_RE.search(srvinfo_result.split("\n", 1)[0])
+        if match:
+            os_info['server_type_string'] = match.group(1)
+
+        for match in SRVINFO_OS_INFO_RE.finditer(srvinfo_result):
+            # os version => os_version, server type => server_type
+            key = match.group(1).replace(" ", "_")
+            os_info[key] = match.group(2)
         if not os_info:
             return Result(None, "Could not get OS information")
 
@@ -1098,7 +1172,7 @@ class EnumOsInfo():
             # Examples:
             # Wk Sv ... Samba 4.8.0-Debian
             # Wk Sv ... (Samba 3.0.0)
-            match = re.search(r".*(Samba\s.*[^)])", server_type_string)
+            match = SRVINFO_SAMBA_VERSION_RE.search(server_type_string)
             if match:
                 return  f"Linux/Unix ({match.group(1)})"
             return  "Linux/Unix"
@@ -1124,9 +1198,11 @@ class EnumUsersRpc():
         print_heading(f"Users via RPC on {self.target.host}")
         output = {}
 
+        results = parallel_map(lambda enum: enum(), [self.enum_from_querydispinfo, self.enum_from_enumdomusers], max_workers=2)
+
         # Get user via querydispinfo
         print_info("Enumerating users via 'querydispinfo'")
-        users_qdi = self.enum_from_querydispinfo()
+        users_qdi = next(results)
         if users_qdi.retval is None:
             output = process_error(users_qdi.retmsg, ["users"], module_name, output)
             users_qdi_output = None
@@ -1136,7 +1212,7 @@ class EnumUsersRpc():
 
         # Get user via enumdomusers
         print_info("Enumerating users via 'enumdomusers'")
-        users_edu = self.enum_from_enumdomusers()
+        users_edu = next(results)
         if users_edu.retval is None:
             output = process_error(users_edu.retmsg, ["users"], module_name, output)
             users_edu_output = None
@@ -1155,9 +1231,9 @@ class EnumUsersRpc():
         if users:
             if self.detailed:
                 print_info("Enumerating users details")
-                for rid in users.keys():
-                    name = users[rid]['username']
-                    user_details = self.get_details_from_rid(rid, name)
+                rids = list(users)
+                results = parallel_map(self.get_details_from_rid, rids, [users[rid]['username'] for rid in rids], max_workers=self.target.threads)
+                for rid, user_details in zip(rids, results):
                     if user_details.retval:
                         print_success(user_details.retmsg)
                         users[rid]["details"] = user_details.retval
@@ -1165,7 +1241,7 @@ class EnumUsersRpc():
                         output = process_error(user_details.retmsg, ["users"], module_name, output)
                         users[rid]["details"] = ""
 
-            print_success(f"After merging user results we have {len(users.keys())} users total:\n{yamlize(users, sort=True)}")
+            print_success(f"After merging user results we have {len(users)} users total:\n{yamlize(users, sort=True)}")
 
         output["users"] = users
         return output
@@ -1211,19 +1287,20 @@ class EnumUsersRpc():
 
         # Example output of rpcclient's querydispinfo:
         # index: 0x2 RID: 0x3e9 acb: 0x00000010 Account: tester	Name: 	Desc:
-        for line in filter(None, querydispinfo.retval.split('\n')):
-            match = re.search(r"index:\s+.*\s+RID:\s+(0x[A-F-a-f0-9]+)\s+acb:\s+(.*)\s+Account:\s+(.*)\s+Name:\s+(.*)\s+Desc:\s+(.*)", line)
-            if match:
-                rid = match.group(1)
-                rid = str(int(rid, 16))
-                acb = match.group(2)
-                username = match.group(3)
-                name = match.group(4)
-                description = match.group(5)
-                users[rid] = OrderedDict({"username":username, "name":name, "acb":acb, "description":description})
-            else:
-                return Result(None, "Could not extract users from querydispinfo output, please open a GitHub issue")
-        return Result(users, f"Found {len(users.keys())} users via 'querydispinfo'")
+        # The regex never matches across lines, so every non-empty line must yield exactly one match
+        matches = 0
+        for match in QUERYDISPINFO_RE.finditer(querydispinfo.retval):
+            rid = match.group(1)
+            rid = str(int(rid, 16))
+            acb = match.group(2)
+            username = match.group(3)
+            name = match.group(4)
+            description = match.group(5)
+            users[rid] = {"username":username, "name":name, "acb":acb, "description":description}
+            matches += 1
+        if matches != sum(1 for line in querydispinfo.retval.split('\n') if line):
+            return Result(None, "Could not extract users from querydispinfo output, please open a GitHub issue")
+        return Result(users, f"Found {len(users)} users via 'querydispinfo'")
 
     def enum_from_enumdomusers(self):
         '''
@@ -1237,16 +1314,16 @@ class EnumUsersRpc():
 
         # Example output of rpcclient's enumdomusers:
         # user:[tester] rid:[0x3e9]
-        for line in enumdomusers.retval.splitlines():
-            match = re.search(r"user:\[(.*)\]\srid:\[(0x[A-F-a-f0-9]+)\]", line)
-            if match:
-                username = match.group(1)
-                rid = match.group(2)
-                rid = str(int(rid, 16))
-                users[rid] = {"username":username}
-            else:
-                return Result(None, "Could not extract users from eumdomusers output, please open a GitHub issue")
-        return Result(users, f"Found {len(users.keys())} users via 'enumdomusers'")
+        matches = 0
+        for match in ENUMDOMUSERS_RE.finditer(enumdomusers.retval):
+            username = match.group(1)
+            rid = match.group(2)
+            rid = str(int(rid, 16))
+            users[rid] = {"username":username}
+            matches += 1
+        if enumdomusers.retval and matches != enumdomusers.retval.count('\n') + 1:
+            return Result(None, "Could not extract users from eumdomusers output, please open a GitHub issue")
+        return Result(users, f"Found {len(users)} users via 'enumdomusers'")
 
     def get_details_from_rid(self, rid, name):
         '''
@@ -1256,7 +1333,7 @@ class EnumUsersRpc():
         if not valid_rid(rid):
             return Result(None, f"Invalid rid passed: {rid}")
 
-        details = OrderedDict()
+        details = {}
         command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", "-c", f"queryuser {rid}", self.target.host]
         result = run(command, "Attempting to get detailed user info", self.target.samba_config, timeout=self.target.timeout)
 
@@ -1267,28 +1344,19 @@ class EnumUsersRpc():
         if "NT_STATUS_NO_SUCH_USER" in result.retmsg:
             return Result(None, f"Could not find details for user '{name}: STATUS_NO_SUCH_USER")
 
-        match = re.search("([^\n]*User Name.*logon_hrs[^\n]*)", result.retmsg, re.DOTALL)
-        if match:
-            user_info = match.group(1)
-            user_info = user_info.replace("\t", "")
-
-            for line in filter(None, user_info.split('\n')):
-                if ':' in line:
-                    (key, value) = line.split(":", 1)
-                    key = key.rstrip()
-                    # Skip user and full name, we have this information already
-                    if "User Name" in key or "Full Name" in key:
-                        continue
-                    details[key] = value
-                else:
-                    details[line] = ""
+        user_info = extract_lines(result.retmsg, "User Name", "logon_hrs")
+        if user_info:
+            for match in DETAILS_RE.finditer(user_info):
+                key = match.group(1)
+                # Skip user and full name, we have this information already
+                if "User Name" in key or "Full Name" in key:
+                    continue
+                details[key] = match.group(2) or ""
 
             if "acb_info" in details and valid_hex(details["acb_info"]):
-                for key in ACB_DICT:
-                    if int(details["acb_info"], 16) & key:
-                        details[ACB_DICT[key]] = True
-                    else:
-                        details[ACB_DICT[key]] = False
+                acb_info = int(details["acb_info"], 16)
+                for flag, flag_name in ACB_DICT.items():
+                    details[flag_name] = bool(acb_info & flag)
 
             return Result(details, f"Found details for user '{name}' (RID {rid})")
         return Result(None, f"Could not find details for user '{name}' (RID {rid})")
@@ -1311,9 +1379,10 @@ class EnumGroupsRpc():
         output = {}
         groups = None
 
-        for grouptype in ["local", "builtin", "domain"]:
+        grouptype_list = ["local", "builtin", "domain"]
+        results = parallel_map(self.enum, grouptype_list, max_workers=len(grouptype_list))
+        for grouptype, enum in zip(grouptype_list, results):
             print_info(f"Enumerating {grouptype} groups")
-            enum = self.enum(grouptype)
             if enum.retval is None:
                 output = process_error(enum.retmsg, ["groups"], module_name, output)
             else:
@@ -1324,13 +1393,14 @@ class EnumGroupsRpc():
 
         #FIXME: Adjust users enum stuff above so that it looks similar to this one?
         if groups:
+            rids = list(groups)
+            groupnames = [groups[rid]['groupname'] for rid in rids]
+            grouptypes = [groups[rid]['type'] for rid in rids]
+
             if self.with_members:
                 print_info("Enumerating group members")
-                for rid in groups.keys():
-                    # Get group members
-                    groupname = groups[rid]['groupname']
-                    grouptype = groups[rid]['type']
-                    group_members = self.get_members_from_name(groupname, grouptype, rid)
+                results = parallel_map(self.get_members_from_name, groupnames, grouptypes, rids, max_workers=self.target.threads)
+                for rid, group_members in zip(rids, results):
                     if group_members.retval or group_members.retval == '':
                         print_success(group_members.retmsg)
                     else:
@@ -1339,18 +1409,15 @@ class EnumGroupsRpc():
 
             if self.detailed:
                 print_info("Enumerating group details")
-                for rid in groups.keys():
-                    groupname = groups[rid]["groupname"]
-                    grouptype = groups[rid]["type"]
-                    details = self.get_details_from_rid(rid, groupname, grouptype)
-
+                results = parallel_map(self.get_details_from_rid, rids, groupnames, grouptypes, max_workers=self.target.threads)
+                for rid, details in zip(rids, results):
                     if details.retval:
                         print_success(details.retmsg)
                     else:
                         output = process_error(details.retmsg, ["groups"], module_name, output)
                     groups[rid]["details"] = details.retval
 
-            print_success(f"After merging groups results we have {len(groups.keys())} groups total:\n{yamlize(groups, sort=True)}")
+            print_success(f"After merging groups results we have {len(groups)} groups total:\n{yamlize(groups, sort=True)}")
         output["groups"] = groups
         return output
 
@@ -1359,14 +1426,8 @@ class EnumGroupsRpc():
         Tries to enumerate all groups by calling rpcclient's 'enumalsgroups builtin', 'enumalsgroups domain' as well
         as 'enumdomgroups'.
         '''
-        grouptype_dict = {
-            "builtin":"enumalsgroups builtin",
-            "local":"enumalsgroups domain",
-            "domain": "enumdomgroups"
-        }
-
-        if grouptype not in ["builtin", "domain", "local"]:
-            return Result(None, f"Unsupported grouptype, supported types are: { ','.join(grouptype_dict.keys()) }")
+        if grouptype not in GROUP_TYPES:
+            return Result(None, f"Unsupported grouptype, supported types are: { ','.join(GROUP_TYPES) }")
 
         groups = {}
         enum = self.enum_by_grouptype(grouptype)
@@ -1375,44 +1436,35 @@ class EnumGroupsRpc():
             return enum
 
         if not enum.retval:
-            return Result({}, f"Found 0 group(s) via '{grouptype_dict[grouptype]}'")
+            return Result({}, f"Found 0 group(s) via '{GROUP_TYPES[grouptype]}'")
 
-        match = re.search("(group:.*)", enum.retval, re.DOTALL)
-        if not match:
-            return Result(None, f"Could not parse result of {grouptype_dict[grouptype]} command, please open a GitHub issue")
+        if "group:" not in enum.retval:
+            return Result(None, f"Could not parse result of {GROUP_TYPES[grouptype]} command, please open a GitHub issue")
 
         # Example output of rpcclient's group commands:
         # group:[RAS and IAS Servers] rid:[0x229]
-        for line in enum.retval.splitlines():
-            match = re.search(r"group:\[(.*)\]\srid:\[(0x[A-F-a-f0-9]+)\]", line)
-            if match:
-                groupname = match.group(1)
-                rid = match.group(2)
-                rid = str(int(rid, 16))
-                groups[rid] = OrderedDict({"groupname":groupname, "type":grouptype})
-            else:
-                return Result(None, f"Could not extract groups from {grouptype_dict[grouptype]} output, please open a GitHub issue")
-        return Result(groups, f"Found {len(groups.keys())} groups via '{grouptype_dict[grouptype]}'")
+        # The regex never matches across lines, so every line must yield exactly one match
+        matches = 0
+        for match in ENUMGROUPS_RE.finditer(enum.retval):
+            groupname = match.group(1)
+            rid = match.group(2)
+            rid = str(int(rid, 16))
+            groups[rid] = {"groupname":groupname, "type":grouptype}
+            matches += 1
+        if matches != enum.retval.count('\n') + 1:
+            return Result(None, f"Could not extract groups from {GROUP_TYPES[grouptype]} output, please open a GitHub issue")
+        return Result(groups, f"Found {len(groups)} groups via '{GROUP_TYPES[grouptype]}'")
 
     def enum_by_grouptype(self, grouptype):
         '''
         Tries to fetch groups via rpcclient's enumalsgroups (so called alias groups) and enumdomgroups.
-        Grouptype "builtin", "local" and "domain" are supported.
+        Grouptype "builtin", "local" and "domain" are supported, the grouptype is validated by enum().
         '''
-        grouptype_dict = {
-            "builtin":"enumalsgroups builtin",
-            "local":"enumalsgroups domain",
-            "domain": "enumdomgroups"
-        }
-
-        if grouptype not in ["builtin", "domain", "local"]:
-            return Result(None, f"Unsupported grouptype, supported types are: { ','.join(grouptype_dict.keys()) }")
-
-        command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", "-c", f"{grouptype_dict[grouptype]}", self.target.host]
+        command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", "-c", f"{GROUP_TYPES[grouptype]}", self.target.host]
         result = run(command, f"Attempting to get {grouptype} groups", self.target.samba_config, timeout=self.target.timeout)
 
         if not result.retval:
-            return Result(None, f"Could not get groups via '{grouptype_dict[grouptype]}': {result.retmsg}")
+            return Result(None, f"Could not get groups via '{GROUP_TYPES[grouptype]}': {result.retmsg}")
 
         return Result(result.retmsg, "")
 
@@ -1445,7 +1497,7 @@ class EnumGroupsRpc():
         if not valid_rid(rid):
             return Result(None, f"Invalid rid passed: {rid}")
 
-        details = OrderedDict()
+        details = {}
         command = ["rpcclient", "-W", self.target.workgroup, "-U", f'{self.creds.user}%{self.creds.pw}', "-c", f"querygroup {rid}", self.target.host]
         result = run(command, "Attempting to get detailed group info", self.target.samba_config, timeout=self.target.timeout)
 
@@ -1456,20 +1508,14 @@ class EnumGroupsRpc():
         if "NT_STATUS_NO_SUCH_GROUP" in result.retmsg:
             return Result(None, f"Could not get details for {grouptype} group '{groupname}' (RID {rid}): STATUS_NO_SUCH_GROUP")
 
-        match = re.search("([^\n]*Group Name.*Num Members[^\n]*)", result.retmsg, re.DOTALL)
-        if match:
-            group_info = match.group(1)
-            group_info = group_info.replace("\t", "")
-
-            for line in filter(None, group_info.split('\n')):
-                if ':' in line:
-                    (key, value) = line.split(":", 1)
-                    # Skip group name, we have this information already
-                    if "Group Name" in key:
-                        continue
-                    details[key] = value
-                else:
-                    details[line] = ""
+        group_info = extract_lines(result.retmsg, "Group Name", "Num Members")
+        if group_info:
+            for match in DETAILS_RE.finditer(group_info):
+                key = match.group(1)
+                # Skip group name, we have this information already
+                if "Group Name" in key:
+                    continue
+                details[key] = match.group(2) or ""
 
             return Result(details, f"Found details for {grouptype} group '{groupname}' (RID {rid})")
         return Result(None, f"Could not find details for {grouptype} group '{groupname}' (RID {rid})")
@@ -1479,13 +1525,15 @@ class EnumGroupsRpc():
 class RidCycleParams:
     '''
     Stores the various parameters needed for RID cycling. rid_ranges and known_usernames are mandatory.
+    batch_size is the number of RIDs which are looked up with a single rpcclient call.
     enumerated_input is a dictionary which contains already enumerated input like "users,
     "groups", "machines" and/or a domain sid. By default enumerated_input is an empty dict
     and will be filled up during the tool run.
     '''
-    def __init__(self, rid_ranges, known_usernames):
+    def __init__(self, rid_ranges, known_usernames, batch_size=RID_BATCH_SIZE):
         self.rid_ranges = rid_ranges
         self.known_usernames = known_usernames
+        self.batch_size = batch_size
         self.enumerated_input = {}
 
     def set_enumerated_input(self, enum_input):
@@ -1536,7 +1584,7 @@ class RidCycling():
             rid_cycler = self.rid_cycle(sid, self.cycle_params.rid_ranges)
             for result in rid_cycler:
                 # We need the top level key to find out whether we got users, groups, machines or the domain_sid...
-                top_level_key = list(result.retval.keys())[0]
+                top_level_key = next(iter(result.retval))
 
                 # We found the domain_sid...
                 if top_level_key == 'domain_sid':
@@ -1545,7 +1593,7 @@ class RidCycling():
 
                 # ...otherwise "users", "groups" or "machines".
                 # Get the RID of what we found (user, group or machine RID) as well as the corresponding entry (dict).
-                rid = list(result.retval[top_level_key])[0]
+                rid = next(iter(result.retval[top_level_key]))
                 entry = result.retval[top_level_key][rid]
 
                 # If we have the RID already, we continue...
@@ -1562,11 +1610,9 @@ class RidCycling():
 
                 if self.detailed and ("users" in top_level_key or "groups" in top_level_key):
                     if "users" in top_level_key:
-                        rid, entry = list(result.retval["users"].items())[0]
                         name = entry["username"]
                         details = EnumUsersRpc(self.target, self.creds, False).get_details_from_rid(rid, name)
                     elif "groups" in top_level_key:
-                        rid, entry = list(result.retval["groups"].items())[0]
                         groupname = entry["groupname"]
                         grouptype = entry["type"]
                         details = EnumGroupsRpc(self.target, self.creds, False, False).get_details_from_rid(rid, groupname, grouptype)
@@ -1588,11 +1634,12 @@ class RidCycling():
         '''
         Tries to enumerate SIDs by looking up user names via rpcclient's lookupnames and by using rpcclient's lsaneumsid.
         '''
-        sids = []
-        sid_patterns_list = [r"(S-1-5-21-[\d-]+)-\d+", r"(S-1-5-[\d-]+)-\d+", r"(S-1-22-[\d-]+)-\d+"]
+        # A dict is used as an insertion ordered set
+        sids = {}
 
-        # Try to get a valid SID from well-known user names
-        for known_username in users.split(','):
+        # Try to get a valid SID from well-known user names, skip duplicates as they would only
+        # result in the very same rpcclient lookup again
+        for known_username in dict.fromkeys(users.split(',')):
             command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", "-c", f"lookupnames {known_username}", self.target.host]
             result = run(command, f"Attempting to get SID for user {known_username}", self.target.samba_config, error_filter=False, timeout=self.target.timeout)
             sid_string = result.retmsg
@@ -1601,12 +1648,11 @@ class RidCycling():
             if "NT_STATUS_ACCESS_DENIED" in sid_string or "NT_STATUS_NONE_MAPPED" in sid_string:
                 continue
 
-            for pattern in sid_patterns_list:
-                match = re.search(pattern, sid_string)
+            for sid_re in SID_RES:
+                match = sid_re.search(sid_string)
                 if match:
-                    result = match.group(1)
-                    if result not in sids:
-                        sids.append(result)
+                    sids[match.group(1)] = None
+                    break
 
         #FIXME: Use nt_status_error_filter - then remove the error_filter=False part above
         # Try to get SID list via lsaenumsid
@@ -1614,51 +1660,56 @@ class RidCycling():
         result = run(command, "Attempting to get SIDs via 'lsaenumsid'", self.target.samba_config, error_filter=False, timeout=self.target.timeout)
 
         if "NT_STATUS_ACCESS_DENIED" not in result.retmsg:
-            for pattern in sid_patterns_list:
-                match_list = re.findall(pattern, result.retmsg)
-                for match in match_list:
-                    if match not in sids:
-                        sids.append(match)
+            sids.update(dict.fromkeys(SID_ANY_RE.findall(result.retmsg)))
 
         if sids:
-            return Result(sids, f"Found {len(sids)} SID(s)")
+            return Result(list(sids), f"Found {len(sids)} SID(s)")
         return Result(None, "Could not get any SIDs")
 
     def rid_cycle(self, sid, rid_ranges):
         '''
         Takes a SID as first parameter well as list of RID ranges (as tuples) as second parameter and does RID cycling.
+        Up to batch_size RIDs (see RidCycleParams) are looked up with a single rpcclient call.
         '''
+        batch_size = self.cycle_params.batch_size
+
+        # Only the lookupsids command changes between the rpcclient calls
+        command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", self.target.host, "-c", ""]
         for rid_range in rid_ranges:
             (start_rid, end_rid) = rid_range
 
             #FIXME: Use nt_status_error_filter - then remove the error_filter=False part above
-            for rid in range(start_rid, end_rid+1):
-                command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", self.target.host, "-c", f"lookupsids {sid}-{rid}"]
+            for batch_start in range(start_rid, end_rid+1, batch_size):
+                batch_end = min(batch_start+batch_size-1, end_rid)
+                sids = ' '.join(f"{sid}-{rid}" for rid in range(batch_start, batch_end+1))
+                command[-1] = f"lookupsids {sids}"
                 result = run(command, "RID Cycling", self.target.samba_config, error_filter=False, timeout=self.target.timeout)
 
                 # Example: S-1-5-80-3139157870-2983391045-3678747466-658725712-1004 *unknown*\*unknown* (8)
-                match = re.search(r"(S-\d+-\d+-\d+-[\d-]+\s+(.*)\s+[^\)]+\))", result.retmsg)
-                if match:
+                # There is one line per looked up SID, the RID is taken from the SID itself
+                for match in LOOKUPSIDS_RE.finditer(result.retmsg):
                     sid_and_user = match.group(1)
-                    entry = match.group(2)
+                    rid = int(match.group(2))
+                    entry = match.group(3)
+                    sid_type = match.group(4)
 
                     # Samba servers sometimes claim to have user accounts
                     # with the same name as the UID/RID. We don't report these.
-                    if re.search(r"-(\d+) .*\\\1 \(", sid_and_user):
+                    if LOOKUPSIDS_SAMBA_UID_RE.search(sid_and_user):
                         continue
 
                     # "(1)" = User, "(2)" = Domain Group,"(3)" = Domain SID,"(4)" = Local Group
                     # "(5)" = Well-known group, "(6)" = Deleted account, "(7)" = Invalid account
                     # "(8)" = Unknown, "(9)" = Machine/Computer account
-                    if "(1)" in sid_and_user:
+                    if sid_type == "1":
                         yield Result({"users":{str(rid):{"username":entry}}}, f"Found user '{entry}' (RID {rid})")
-                    elif "(2)" in sid_and_user:
+                    elif sid_type == "2":
                         yield Result({"groups":{str(rid):{"groupname":entry, "type":"domain"}}}, f"Found domain group '{entry}' (RID {rid})")
-                    elif "(3)" in sid_and_user:
+                    elif sid_type == "3":
                         yield Result({"domain_sid":f"{sid}-{rid}"}, f"Found domain SID {sid}-{rid}")
-                    elif "(4)" in sid_and_user:
+                    elif sid_type == "4":
                         yield Result({"groups":{str(rid):{"groupname":entry, "type":"builtin"}}}, f"Found builtin group '{entry}' (RID {rid})")
-                    elif "(9)" in sid_and_user:
+                    elif sid_type == "9":
                         yield Result({"machines":{str(rid):{"machine":entry}}}, f"Found machine '{entry}' (RID {rid})")
 
 ### Shares Enumeration
@@ -1685,11 +1736,12 @@ class EnumShares():
             # This will print success even if no shares were found (which is not an error.)
             print_success(enum.retmsg)
             shares = enum.retval
-            # Check access if there are any shares.
+            # Check access if there are any shares
             if enum.retmsg:
-                for share in sorted(shares):
+                share_list = sorted(shares)
+                results = parallel_map(self.check_access, share_list, max_workers=self.target.threads)
+                for share, access in zip(share_list, results):
                     print_info(f"Testing share {share}")
-                    access = self.check_access(share)
                     if access.retval is None:
                         output = process_error(access.retmsg, ["shares"], module_name, output)
                         continue
@@ -1711,17 +1763,11 @@ class EnumShares():
         if not result.retval:
             return Result(None, f"Could not list shares: {result.retmsg}")
 
-        shares = {}
-        match_list = re.findall(r"^\s*([\S]+)\s+(Device|Disk|IPC|Printer)[ \t]*([^\n]*)$", result.retmsg, re.MULTILINE|re.IGNORECASE)
-        if match_list:
-            for entry in match_list:
-                share_name = entry[0]
-                share_type = entry[1]
-                share_comment = entry[2].rstrip()
-                shares[share_name] = {'type':share_type, 'comment':share_comment}
+        # Each match consists of share name, share type and share comment
+        shares = {match.group(1):{'type':match.group(2), 'comment':match.group(3).rstrip()} for match in SHARES_RE.finditer(result.retmsg)}
 
         if shares:
-            return Result(shares, f"Found {len(shares.keys())} share(s):\n{yamlize(shares, sort=True)}")
+            return Result(shares, f"Found {len(shares)} share(s):\n{yamlize(shares, sort=True)}")
         return Result(shares, f"Found 0 share(s) for user '{self.creds.user}' with password '{self.creds.pw}', try a different user")
 
     def check_access(self, share):
@@ -1740,28 +1786,31 @@ class EnumShares():
         command = ["smbclient", "-t", f"{self.target.timeout}", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", f"//{self.target.host}/{share}", "-c", "dir"]
         result = run(command, f"Attempting to map share //{self.target.host}/{share}", self.target.samba_config, error_filter=False)
 
-        if "NT_STATUS_BAD_NETWORK_NAME" in result.retmsg:
+        # Scan the output only once for all status messages, they are evaluated in order of precedence below
+        status = set(SHARE_ACCESS_STATUS_RE.findall(result.retmsg))
+
+        if "NT_STATUS_BAD_NETWORK_NAME" in status:
             return Result(None, "Share doesn't exist")
 
-        if "NT_STATUS_ACCESS_DENIED listing" in result.retmsg:
+        if "NT_STATUS_ACCESS_DENIED listing" in status:
             return Result({"mapping":"ok", "listing":"denied"}, "Mapping: OK, Listing: DENIED")
 
-        if "NT_STATUS_WRONG_PASSWORD" in result.retmsg:
+        if "NT_STATUS_WRONG_PASSWORD" in status:
             return Result({"mapping":"ok", "listing":"wrong password"}, "Mapping: OK, Listing: WRONG PASSWORD")
 
-        if "tree connect failed: NT_STATUS_ACCESS_DENIED" in result.retmsg:
+        if "tree connect failed: NT_STATUS_ACCESS_DENIED" in status:
             return Result({"mapping":"denied", "listing":"n/a"}, "Mapping: DENIED, Listing: N/A")
 
-        if "NT_STATUS_INVALID_INFO_CLASS" in result.retmsg or "NT_STATUS_NETWORK_ACCESS_DENIED" in result.retmsg:
+        if "NT_STATUS_INVALID_INFO_CLASS" in status or "NT_STATUS_NETWORK_ACCESS_DENIED" in status:
             return Result({"mapping":"ok", "listing":"not supported"}, "Mapping: OK, Listing: NOT SUPPORTED")
 
-        if "NT_STATUS_OBJECT_NAME_NOT_FOUND" in result.retmsg:
+        if "NT_STATUS_OBJECT_NAME_NOT_FOUND" in status:
             return Result(None, "Could not check share: STATUS_OBJECT_NAME_NOT_FOUND")
 
-        if "NT_STATUS_INVALID_PARAMETER" in result.retmsg:
+        if "NT_STATUS_INVALID_PARAMETER" in status:
             return Result(None, "Could not check share: STATUS_INVALID_PARAMETER")
 
-        if re.search(r"\n\s+\.\.\s+D.*\d{4}\n", result.retmsg) or re.search(r".*blocks\sof\ssize.*blocks\savailable.*", result.retmsg):
+        if SHARE_LISTING_RE.search(result.retmsg):
             return Result({"mapping":"ok", "listing":"ok"}, "Mapping: OK, Listing: OK")
 
         return Result(None, "Could not parse result of smbclient command, please open a GitHub issue")
@@ -1801,23 +1850,24 @@ class BruteForceShares():
         found_count = 0
         try:
             with open(self.brute_params.shares_file) as f:
-                for share in f:
-                    share = share.rstrip()
+                shares = [share.rstrip() for share in f]
+        except (OSError, UnicodeDecodeError):
+            output = process_error(f"Failed to open {self.brute_params.shares_file}", ["shares"], module_name, output)
+            shares = []
 
-                    # Skip all shares we might have found by the enum_shares module already
-                    if output["shares"] is not None and share in output["shares"].keys():
-                        continue
+        # Skip all shares we might have found by the enum_shares module already, each share is only checked once
+        shares = [share for share in dict.fromkeys(shares) if output["shares"] is None or share not in output["shares"]]
 
-                    result = EnumShares(self.target, self.creds).check_access(share)
-                    if result.retval:
-                        if output["shares"] is None:
-                            output["shares"] = {}
-                        print_success(f"Found share: {share}")
-                        print_success(result.retmsg)
-                        output["shares"][share] = result.retval
-                        found_count += 1
-        except:
-            output = process_error(f"Failed to open {self.brute_params.shares_file}", ["shares"], module_name, output)
+        enum_shares = EnumShares(self.target, self.creds)
+        results = parallel_map(enum_shares.check_access, shares, max_workers=self.target.threads)
+        for share, result in zip(shares, results):
+            if result.retval:
+                if output["shares"] is None:
+                    output["shares"] = {}
+                print_success(f"Found share: {share}")
+                print_success(result.retmsg)
+                output["shares"][share] = result.retval
+                found_count += 1
 
         if found_count == 0:
             output = process_error("Could not find any (new) shares", ["shares"], module_name, output)
@@ -1880,13 +1930,8 @@ class EnumPolicy():
             policy["domain_password_information"]["min_pw_length"] = result['Buffer']['Password']['MinPasswordLength'] or "None"
             policy["domain_password_information"]["min_pw_age"] = self.policy_to_human(int(result['Buffer']['Password']['MinPasswordAge']['LowPart']), int(result['Buffer']['Password']['MinPasswordAge']['HighPart']))
             policy["domain_password_information"]["max_pw_age"] = self.policy_to_human(int(result['Buffer']['Password']['MaxPasswordAge']['LowPart']), int(result['Buffer']['Password']['MaxPasswordAge']['HighPart']))
-            policy["domain_password_information"]["pw_properties"] = []
             pw_prop = result['Buffer']['Password']['PasswordProperties']
-            for bitmask in DOMAIN_FIELDS:
-                if pw_prop & bitmask == bitmask:
-                    policy["domain_password_information"]["pw_properties"].append({DOMAIN_FIELDS[bitmask]:True})
-                else:
-                    policy["domain_password_information"]["pw_properties"].append({DOMAIN_FIELDS[bitmask]:False})
+            policy["domain_password_information"]["pw_properties"] = [{field:bool(pw_prop & bitmask)} for bitmask, field in DOMAIN_FIELDS.items()]
         except Exception as e:
             nt_status_error = nt_status_error_filter(str(e))
             if nt_status_error:
@@ -1961,7 +2006,6 @@ class EnumPolicy():
         if resp4['ErrorCode'] != 0:
             return Result((None, None), "SamrOpenDomain failed")
 
-        #domains = resp2['Buffer']['Buffer']
         domain_handle = resp4['DomainHandle']
 
         return Result((dce, domain_handle), "")
@@ -1993,13 +2037,18 @@ class EnumPolicy():
         else:
             tmp = abs(high) * (1e-7)
 
+        # Round to microseconds first (like datetime does), otherwise e.g. 1799.9999999999998s would
+        # end up as 29 minutes. Everything beyond the year 9999 is treated as invalid.
         try:
-            minutes = datetime.utcfromtimestamp(tmp).minute
-            hours = datetime.utcfromtimestamp(tmp).hour
-            time_diff = datetime.utcfromtimestamp(tmp) - datetime.utcfromtimestamp(0)
-            days = time_diff.days
-        except:
+            seconds = int(round(tmp, 6))
+        except (ValueError, OverflowError):
             return "invalid time"
+        if seconds >= 253402300800:
+            return "invalid time"
+
+        days, seconds = divmod(seconds, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        minutes = seconds // 60
 
         if days > 1:
             time += f"{days} days "
@@ -2045,7 +2094,6 @@ class EnumPrinters():
         '''
         command = ["rpcclient", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", "-c", "enumprinters", self.target.host]
         result = run(command, "Attempting to get printer info", self.target.samba_config, timeout=self.target.timeout)
-        printers = {}
 
         if not result.retval:
             return Result(None, f"Could not get printer info via 'enumprinters': {result.retmsg}")
@@ -2056,18 +2104,12 @@ class EnumPrinters():
         if "No printers returned." in result.retmsg:
             return Result({}, "No printers returned (this is not an error)")
 
-        match_list = re.findall(r"\s*flags:\[([^\n]*)\]\n\s*name:\[([^\n]*)\]\n\s*description:\[([^\n]*)\]\n\s*comment:\[([^\n]*)\]", result.retmsg, re.MULTILINE)
-        if not match_list:
+        # Each match consists of flags, name, description and comment of a printer
+        printers = {match.group(2):{"description":match.group(3), "comment":match.group(4), "flags":match.group(1)} for match in PRINTERS_RE.finditer(result.retmsg)}
+        if not printers:
             return Result(None, "Could not parse result of enumprinters command, please open a GitHub issue")
 
-        for match in match_list:
-            flags = match[0]
-            name = match[1]
-            description = match[2]
-            comment = match[3]
-            printers[name] = OrderedDict({"description":description, "comment":comment, "flags":flags})
-
-        return Result(printers, f"Found {len(printers.keys())} printer(s):\n{yamlize(printers, sort=True)}")
+        return Result(printers, f"Found {len(printers)} printer(s):\n{yamlize(printers, sort=True)}")
 
 ### Services Enumeration
 
@@ -2099,21 +2141,16 @@ class EnumServices():
         '''
         command = ["net", "rpc", "service", "list", "-t", f"{self.target.timeout}", "-W", self.target.workgroup, "-U", f"{self.creds.user}%{self.creds.pw}", "-I", self.target.host]
         result = run(command, "Attempting to get services", self.target.samba_config)
-        services = {}
 
         if not result.retval:
             return Result(None, f"Could not get services via 'net rpc service list': {result.retmsg}")
 
-        match_list = re.findall(r"([^\s]*)\s*\"(.*)\"", result.retmsg, re.MULTILINE)
-        if not match_list:
+        # Each match consists of name and description of a service
+        services = {match.group(1):{"description":match.group(2)} for match in SERVICES_RE.finditer(result.retmsg)}
+        if not services:
             return Result(None, "Could not parse result of 'net rpc service list' command, please open a GitHub issue")
 
-        for match in match_list:
-            name = match[0]
-            description = match[1]
-            services[name] = OrderedDict({"description":description})
-
-        return Result(services, f"Found {len(services.keys())} service(s):\n{yamlize(services, True)}")
+        return Result(services, f"Found {len(services)} service(s):\n{yamlize(services, True)}")
 
 ### Enumerator
 
@@ -2133,15 +2170,15 @@ class Enumerator():
         # Init target and creds
         try:
             self.creds = Credentials(args.user, args.pw)
-            self.target = Target(args.host, args.workgroup, timeout=args.timeout)
-        except:
+            self.target = Target(args.host, args.workgroup, timeout=args.timeout, threads=args.threads)
+        except Exception:
             raise RuntimeError(f"Target {args.host} is not a valid IP or could not be resolved")
 
         # Init default SambaConfig, make sure 'client ipc signing' is not required
         try:
             samba_config = SambaConfig(['client ipc signing = auto'])
             self.target.samba_config = samba_config
-        except:
+        except OSError:
             raise RuntimeError("Could not create default samba configuration")
 
         # Add target host and creds to output, so that it will end up in the JSON/YAML
@@ -2156,8 +2193,7 @@ class Enumerator():
     def run(self):
         # RID Cycling - init parameters
         if self.args.R:
-            rid_ranges = self.prepare_rid_ranges()
-            self.cycle_params = RidCycleParams(rid_ranges, self.args.users)
+            self.cycle_params = RidCycleParams(self.args.rid_ranges, self.args.users, self.args.rid_batch_size)
 
         # Shares Brute Force - init parameters
         if self.args.shares_file:
@@ -2240,15 +2276,13 @@ class Enumerator():
         if ENUM_LDAP_DOMAIN_INFO in modules:
             result = EnumLdapDomainInfo(self.target).run()
             self.output.update(result)
-            if not self.target.workgroup and result["long_domain"]:
-                self.target.update_workgroup(result["long_domain"], True)
+            self.update_workgroup_from(result, "long_domain", True)
 
         # Try to retrieve workstation and nbtstat information
         if ENUM_NETBIOS in modules:
             result = EnumNetbios(self.target).run()
             self.output.update(result)
-            if not self.target.workgroup and result["workgroup"]:
-                self.target.update_workgroup(result["workgroup"])
+            self.update_workgroup_from(result, "workgroup")
 
         # Enumerate supported SMB versions
         if ENUM_SMB in modules:
@@ -2259,7 +2293,7 @@ class Enumerator():
         if ENUM_SESSIONS in modules:
             result = EnumSessions(self.target, self.creds).run()
             self.output.update(result)
-            self.target.sessions = self.output.as_dict()['sessions_possible']
+            self.target.sessions = result['sessions_possible']
 
         # If sessions are not possible, we regenerate the list of modules again.
         # This will only leave those modules in, which don't require authentication
@@ -2271,8 +2305,7 @@ class Enumerator():
         if ENUM_LSAQUERY_DOMAIN_INFO in modules:
             result = EnumLsaqueryDomainInfo(self.target, self.creds).run()
             self.output.update(result)
-            if not self.target.workgroup and result["workgroup"]:
-                self.target.update_workgroup(result["workgroup"])
+            self.update_workgroup_from(result, "workgroup")
 
         # Get OS information like os version, server type string...
         if ENUM_OS_INFO in modules:
@@ -2329,30 +2362,13 @@ class Enumerator():
             else:
                 warn("Aborting remainder of tests since sessions failed, rerun with valid credentials")
 
-    def prepare_rid_ranges(self):
+    def update_workgroup_from(self, result, key, long_domain=False):
         '''
-        Takes a string containing muliple RID ranges and returns a list of ranges as tuples.
+        Takes the workgroup/domain found by an enumeration module, unless a workgroup
+        is already known (e.g. given via -w).
         '''
-        rid_ranges = self.args.ranges
-        rid_ranges_list = []
-
-        for rid_range in rid_ranges.split(','):
-            if rid_range.isdigit():
-                start_rid = rid_range
-                end_rid = rid_range
-            else:
-                [start_rid, end_rid] = rid_range.split("-")
-
-            start_rid = int(start_rid)
-            end_rid = int(end_rid)
-
-            # Reverse if neccessary
-            if start_rid > end_rid:
-                start_rid, end_rid = end_rid, start_rid
-
-            rid_ranges_list.append((start_rid, end_rid))
-
-        return rid_ranges_list
+        if not self.target.workgroup and result[key]:
+            self.target.update_workgroup(result[key], long_domain)
 
     def finish(self):
         errors = []
@@ -2376,14 +2392,26 @@ class Enumerator():
 
 ###
 
+def parallel_map(func, *iterables, max_workers):
+    '''
+    Works like the builtin map(), but calls func in a thread pool of max_workers threads. This is
+    used for independent lookups (mostly samba client calls), which spend their time waiting for
+    the target. The results are yielded lazily in the order of the input, so the caller can
+    evaluate and print them from the main thread as soon as they are available, without any locking.
+    If the caller stops early (break or CTRL+C), calls which have not started yet are cancelled.
+    '''
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(func, *iterables)
+
 def run(command, description="", samba_config=None, error_filter=True, timeout=None):
     '''
     Runs a samba client command (net, nmblookup, smbclient or rpcclient) and does some basic output filtering.
     The samba_config parameter allows to pass in a custom samba config, this allows to modify the behaviour of
     the samba client commands during run (e.g. enforce legacy SMBv1).
     '''
+    # Don't modify the caller's list, it may be reused for further commands
     if samba_config:
-        command += ["-s", f"{samba_config.get_path()}"]
+        command = command + ["-s", f"{samba_config.get_path()}"]
 
     if global_verbose and description:
         print_verbose(f"{description}, running command: {' '.join(shlex.quote(x) for x in command)}")
@@ -2393,14 +2421,11 @@ def run(command, description="", samba_config=None, error_filter=True, timeout=N
         retval = 0
     except TimeoutExpired:
         return Result(False, "timed out")
-    except Exception as e:
+    except CalledProcessError as e:
         output = e.output
         retval = 1
 
-    output = output.decode()
-    for line in output.splitlines(True):
-        if any(entry in line for entry in SAMBA_CLIENT_ERRORS):
-            output = output.replace(line, "")
+    output = SAMBA_CLIENT_ERRORS_RE.sub("", output.decode())
     output = output.rstrip('\n')
 
     if retval == 1 and not output:
@@ -2415,38 +2440,58 @@ def run(command, description="", samba_config=None, error_filter=True, timeout=N
 
 ### Validation Functions
 
-def valid_timeout(timeout):
+def valid_int_range(value, low, high):
     try:
-        timeout = int(timeout)
-        if timeout >= 0 and timeout <= 600:
+        value = int(value)
+        if value >= low and value <= high:
             return True
     except ValueError:
         pass
     return False
 
-def valid_rid_ranges(rid_ranges):
-    if not rid_ranges:
-        return False
+def parse_rid_ranges(rid_ranges):
+    '''
+    Takes a string containing muliple RID ranges and returns a list of ranges as tuples.
+    Returns None if the string is not a valid list of RID ranges.
+    '''
+    rid_ranges_list = []
 
     for rid_range in rid_ranges.split(','):
-        match = re.search(r"^(\d+)-(\d+)$", rid_range)
-        if match:
-            continue
-        if rid_range.isdigit():
-            continue
-        return False
-    return True
+        match = RID_RANGE_RE.fullmatch(rid_range)
+        if not match:
+            return None
+        (start_rid, end_rid) = match.groups()
+        start_rid = int(start_rid)
+        end_rid = int(end_rid or start_rid)
+
+        # Reverse if neccessary
+        if start_rid > end_rid:
+            start_rid, end_rid = end_rid, start_rid
+
+        rid_ranges_list.append((start_rid, end_rid))
+
+    return rid_ranges_list
 
 def valid_shares_file(shares_file):
     fault_shares = []
     NL = '\n'
 
-    if not os.path.exists(shares_file):
-        return Result(False, f"Shares file {shares_file} does not exist")
+    if not os.path.isfile(shares_file):
+        return Result(False, f"Shares file {shares_file} does not exist or is not a file")
 
-    if os.stat(shares_file).st_size == 0:
+    if os.path.getsize(shares_file) == 0:
         return Result(False, f"Shares file {shares_file} is empty")
 
+    # Fast path: if the file contains nothing but legal characters and line breaks and has no empty lines,
+    # every share in it is valid
+    try:
+        with open(shares_file, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return Result(False, f"Could not open shares file {shares_file}")
+    if not data.translate(None, SHARES_FILE_BYTES) and not data.startswith(b"\n") and b"\n\n" not in data:
+        return Result(True, "")
+
     try:
         with open(shares_file) as f:
             line_num = 1
@@ -2455,19 +2500,20 @@ def valid_shares_file(shares_file):
                 if not valid_share(share):
                     fault_shares.append(f"line {line_num}:{share}")
                 line_num += 1
-    except:
+    except (OSError, UnicodeDecodeError):
         return Result(False, f"Could not open shares file {shares_file}")
     if fault_shares:
         return Result(False, f"Shares with illegal characters found in {shares_file}:\n{NL.join(fault_shares)}")
     return Result(True, "")
 
 def valid_share(share):
-    if re.search(r"^[a-zA-Z0-9\._\$-]+$", share):
+    if SHARE_NAME_RE.search(share):
         return True
     return False
 
+@lru_cache(maxsize=256)
 def valid_hex(hexnumber):
-    if re.search("^0x[0-9a-f]+$", hexnumber.lower()):
+    if HEX_RE.search(hexnumber):
         return True
     return False
 
@@ -2478,8 +2524,9 @@ def valid_rid(rid):
         return True
     return False
 
+@lru_cache(maxsize=256)
 def valid_workgroup(workgroup):
-    if re.match(r"^[A-Za-z0-9_\.-]+$", workgroup):
+    if WORKGROUP_RE.match(workgroup):
         return True
     return False
 
@@ -2533,11 +2580,30 @@ def process_error(msg, affected_entries, module_name, output_dict):
     return output_dict
 
 def nt_status_error_filter(msg):
+    # Most messages contain none of the errors, a single regex scan tells us that quickly. Otherwise
+    # the list is walked in order, since the first error listed takes precedence.
+    if not NT_STATUS_COMMON_ERRORS_RE.search(msg):
+        return ""
     for error in NT_STATUS_COMMON_ERRORS:
         if error in msg:
             return error
     return ""
 
+def extract_lines(text, first, last):
+    '''
+    Returns all lines of text starting with the line which contains the first occurrence of first up to
+    the line which contains the last occurrence of last. None is returned if this block cannot be found.
+    '''
+    start = text.find(first)
+    end = text.rfind(last)
+    if start == -1 or end < start + len(first):
+        return None
+    start = text.rfind('\n', 0, start) + 1
+    end = text.find('\n', end)
+    if end == -1:
+        end = len(text)
+    return text[start:end]
+
 def abort(msg):
     '''
     This function is used to abort the tool run on error.
@@ -2557,10 +2623,32 @@ def yamlize(msg, sort=False, rstrip=True):
 
 ### Argument Processing
 
+def workgroup_type(workgroup):
+    if workgroup and not valid_workgroup(workgroup):
+        raise ArgumentTypeError(f"Workgroup '{workgroup}' contains illegal character")
+    return workgroup
+
+def shares_file_type(shares_file):
+    validation = valid_shares_file(shares_file)
+    if not validation.retval:
+        raise ArgumentTypeError(validation.retmsg)
+    return shares_file
+
+def int_range_type(name, low, high):
+    '''
+    Returns an argparse type function, which converts the argument to an integer and checks
+    whether it is in the range low-high.
+    '''
+    def int_type(value):
+        if not valid_int_range(value, low, high):
+            raise ArgumentTypeError(f"{name} must be a valid integer in the range {low}-{high}")
+        return int(value)
+    return int_type
+
 def check_arguments():
     '''
-    Takes all arguments from argv and processes them via ArgumentParser. In addition, some basic
-    validation of arguments is done.
+    Takes all arguments from argv and processes them via ArgumentParser. Single arguments are
+    validated and converted by the parser itself via the *_type() functions.
     '''
 
     global global_verbose
@@ -2592,15 +2680,17 @@ def check_arguments():
     parser.add_argument("-I", action="store_true", help="Get printer information via RPC")
     parser.add_argument("-R", action="store_true", help="Enumerate users via RID cycling")
     parser.add_argument("-N", action="store_true", help="Do an NetBIOS names lookup (similar to nbstat) and try to retrieve workgroup from output")
-    parser.add_argument("-w", dest="workgroup", default='', type=str, help="Specify workgroup/domain manually (usually found automatically)")
+    parser.add_argument("-w", dest="workgroup", default='', type=workgroup_type, help="Specify workgroup/domain manually (usually found automatically)")
     parser.add_argument("-u", dest="user", default='', type=str, help="Specify username to use (default \"\")")
     parser.add_argument("-p", dest="pw", default='', type=str, help="Specify password to use (default \"\")")
     parser.add_argument("-d", action="store_true", help="Get detailed information for users and groups, applies to -U, -G and -R")
     parser.add_argument("-k", dest="users", default=KNOWN_USERNAMES, type=str, help=f'User(s) that exists on remote system (default: {KNOWN_USERNAMES}).\nUsed to get sid with "lookupsid known_username"')
     parser.add_argument("-r", dest="ranges", default=RID_RANGES, type=str, help=f"RID ranges to enumerate (default: {RID_RANGES})")
-    parser.add_argument("-s", dest="shares_file", help="Brute force guessing for shares")
-    parser.add_argument("-t", dest="timeout", default=TIMEOUT, help=f"Sets connection timeout in seconds (default: {TIMEOUT}s)")
+    parser.add_argument("-s", dest="shares_file", type=shares_file_type, help="Brute force guessing for shares")
+    parser.add_argument("-t", dest="timeout", default=TIMEOUT, type=int_range_type("Timeout", 0, 600), help=f"Sets connection timeout in seconds (default: {TIMEOUT}s)")
+    parser.add_argument("-T", dest="threads", default=THREADS, type=int_range_type("Threads", 1, 100), help=f"Sets the number of threads for parallel lookups like share brute forcing or user/group details (default: {THREADS})")
     parser.add_argument("-v", dest="verbose", action="store_true", help="Verbose, show full samba tools commands being run (net, rpcclient, etc.)")
+    parser.add_argument("--rid-batch-size", dest="rid_batch_size", default=RID_BATCH_SIZE, type=int_range_type("The RID cycling batch size", 1, 100), metavar="N", help=f"Sets the number of RIDs looked up per request during RID cycling (default: {RID_BATCH_SIZE}, max: 100)")
     parser.add_argument("--keep", action="store_true", help="Don't delete the Samba configuration file created during tool run after enumeration (useful with -v)")
     out_group = parser.add_mutually_exclusive_group()
     out_group.add_argument("-oJ", dest="out_json_file", help="Writes output to JSON file (extension is added automatically)")
@@ -2626,30 +2716,15 @@ def check_arguments():
     # Only global variable which meant to be modified
     global_verbose = args.verbose
 
-    # Check Workgroup
-    if args.workgroup:
-        if not valid_workgroup(args.workgroup):
-            raise RuntimeError(f"Workgroup '{args.workgroup}' contains illegal character")
-
-    # Check for RID ranges
-    if not valid_rid_ranges(args.ranges):
+    # Check and parse RID ranges, the string is kept in args.ranges for display
+    args.rid_ranges = parse_rid_ranges(args.ranges)
+    if not args.rid_ranges:
         raise RuntimeError("The given RID ranges should be a range '10-20' or just a single RID like '1199'")
 
-    # Check shares file
-    if args.shares_file:
-        validation = valid_shares_file(args.shares_file)
-        if not validation.retval:
-            raise RuntimeError(validation.retmsg)
-
     # Add given users to list of RID cycle users automatically
     if args.user and args.user not in args.users.split(","):
         args.users += f",{args.user}"
 
-    # Check timeout
-    if not valid_timeout(args.timeout):
-        raise RuntimeError("Timeout must be a valid integer in the range 0-600")
-    args.timeout = int(args.timeout)
-
     return args
 
 ### Dependency Checks
@@ -2678,16 +2753,15 @@ def main():
 
     print_banner()
 
-    # Check dependencies and process arguments, make sure yaml can handle OrdereDicts
+    # Check dependencies and process arguments
     try:
-        Dumper.add_representer(OrderedDict, lambda dumper, data: dumper.represent_mapping('tag:yaml.org,2002:map', data.items()))
         check_dependencies()
         args = check_arguments()
     except Exception as e:
         abort(str(e))
 
     # Run!
-    start_time = datetime.now()
+    start_time = perf_counter()
     try:
         enum = Enumerator(args)
         enum.run()
@@ -2700,9 +2774,9 @@ def main():
             result = enum.finish()
             if not result.retval:
                 abort(result.retmsg)
-    elapsed_time = datetime.now() - start_time
+    elapsed_time = perf_counter() - start_time
 
-    print(f"\nCompleted after {elapsed_time.total_seconds():.2f} seconds")
+    print(f"\nCompleted after {elapsed_time:.2f} seconds")
 
 if __name__ == "__main__":
     main()